@@ -2,8 +2,9 @@
 Tools for profiling database queries.
 """
 
-from db_query_profiler.query_timer import time_queries
+from db_query_profiler.query_timer import time_queries, time_queries_async
 
 __all__ = [
     "time_queries",
+    "time_queries_async",
 ]
@@ -2,17 +2,49 @@
 A module for timing SQL queries.
 """
 
-import datetime
+import array
+import asyncio
+import concurrent.futures
+import contextlib
 import functools
+import gc
 import inspect
+import itertools
+import math
+import os
 import pathlib
+import statistics
+import sys
+import time
 import timeit
 import warnings
-from collections.abc import Generator
-from typing import Any, Callable, List, Protocol, Union
+from collections.abc import Iterator
+from typing import Any, Callable, List, Optional, Protocol, Tuple, Union
 
 import tqdm
 
+# The file extensions of the files that are expected to contain SQL
+_SQL_EXTS = (".sql",)
+
+# The rough time, in seconds, that each timed batch of runs should take when
+# the number of runs per batch is calibrated automatically
+_CALIBRATION_TARGET_TIME = 0.01
+
+# The most runs per timed batch when the number of runs per batch is
+# calibrated automatically, used when a run is too fast for the timer
+_MAX_CALIBRATED_NUMBER = 1_000_000
+
+# The most untimed runs of each query to make when detecting when the
+# query has warmed up
+_MAX_WARMUP = 16
+
+# How many times slower than the median run the first timed run of a query
+# can be before warning that the query might need more warming up
+_FIRST_RUN_WARNING_RATIO = 2
+
+# The format of the start and end times printed around the profiling
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 class DatabaseConnection(Protocol):
     """
@@ -25,6 +57,43 @@ class DatabaseConnection(Protocol):
         """
 
 
+class PreparedStatement(Protocol):
+    """
+    Statement that has already been prepared by the database.
+    """
+
+    def execute(self) -> Any:
+        """
+        Execute the prepared statement.
+        """
+
+
+class PreparingDatabaseConnection(Protocol):
+    """
+    Database connector that can prepare statements up front.
+
+    When preparing is turned on, each query is prepared once and the
+    prepared statement is executed on each run so that the timings don't
+    include the time taken to parse and plan the query.
+    """
+
+    def prepare(self, sql: str) -> PreparedStatement:
+        """
+        Prepare a statement.
+        """
+
+
+class AsyncDatabaseConnection(Protocol):
+    """
+    Asynchronous database connector to run SQL against the database.
+    """
+
+    async def execute(self, sql: str) -> Any:
+        """
+        Execute a statement.
+        """
+
+
 def _safe_divide(numerator: float, denominator: float) -> float:
     """
     Return the result of dividing ``numerator`` by ``denominator`` if
@@ -42,6 +111,20 @@ def _safe_divide(numerator: float, denominator: float) -> float:
     return denominator and numerator / denominator
 
 
+def _pstdev(data: array.array) -> float:
+    """
+    Return the population standard deviation of ``data``, or 0 if ``data``
+    is empty.
+
+    :param data: The values to compute the standard deviation of.
+    """
+    if not data:
+        return 0.0
+
+    mean = math.fsum(data) / len(data)
+    return math.sqrt(math.fsum([(x - mean) ** 2 for x in data]) / len(data))
+
+
 class Runner:
     """
     Callable object representing a function.
@@ -49,34 +132,216 @@ class Runner:
     Wrapped into an object rather than left as a function to assign
     additional properties to the functions, making them easier to monitor
     and summarise their statistics.
+
+    By default, the first run of the function is kept out of its statistics
+    since it's usually much slower than the rest (cold caches, etc). Its
+    time is kept in ``cold_start_time`` instead. The number of untimed runs
+    made after the cold start and before the timed runs is kept in
+    ``warmup_runs``.
     """
 
-    def __init__(self, runner: Callable, name: str):
+    # Runners are created for every query file and their attributes are
+    # read and written on every run, so avoid a ``__dict__`` per instance
+    __slots__ = (
+        "_median_time",
+        "_signature",
+        "_stdev_time",
+        "cold_start_time",
+        "exclude_first",
+        "name",
+        "repeat",
+        "runner",
+        "samples",
+        "total_time_ns",
+        "warmup_runs",
+    )
+
+    def __init__(
+        self,
+        runner: Callable[[], Any],
+        name: str,
+        exclude_first: bool = True,
+    ):
         """
         :param runner: A function to be run when the object is called.
         :param name: The name to give this runner.
+        :param exclude_first: Whether to keep the first run of the function
+         out of its statistics. If the first run is a timed run, it's kept
+         as the cold start rather than recorded, so a timed batch of ``n``
+         runs only records ``n - 1`` of them.
         """
-        self.runner = runner
-        self.name = name
+        self.runner: Callable[[], Any] = runner
+        self.name: str = name
+        self.exclude_first: bool = exclude_first
+
+        self.cold_start_time: Optional[float] = None
+        self.warmup_runs: int = 0
 
         self.repeat: int = 0
-        self.total_time: float = 0.0
+        self.total_time_ns: int = 0
+        self.samples: array.array = array.array("d")
+        self._median_time: Optional[float] = None
+        self._stdev_time: Optional[float] = None
+
+        # `inspect.signature` is slow, so only work it out once
+        try:
+            sig = inspect.signature(runner)
+            self._signature = f"[[{sig.parameters}], {sig.return_annotation}]"
+        except (TypeError, ValueError):
+            self._signature = repr(runner)
 
     def __repr__(self):
-        return f"Runner(runner={self.runner}, name='{self.name}')"
+        return f"Runner(name={self.name!r})"
 
     def __str__(self):
-        sig = inspect.signature(self.runner)
+        return f"Runner(runner={self._signature}, name={self.name})"
 
-        return f"Runner(runner=[[{sig.parameters}], {sig.return_annotation}], name={self.name})"
+    def __call__(self, time_it: bool = True, number: int = 1):
+        self.run_batch(number, time_it=time_it)
 
-    def __call__(self, time_it: bool = True):
-        if time_it:
-            self.repeat += 1
-            self.total_time += timeit.timeit(self.runner, number=1)
+    def run_timed(self) -> None:
+        """
+        Run the runner once, timing it.
+        """
+        self.run_batch(1)
+
+    def run_untimed(self) -> None:
+        """
+        Run the runner once without timing it (unless it's the cold start).
+        """
+        if self._is_cold:
+            self._run_cold_start()
         else:
             self.runner()
 
+    @property
+    def _is_cold(self) -> bool:
+        """
+        Whether the next run of this runner should be its cold start.
+        """
+        return self.exclude_first and self.cold_start_time is None
+
+    def _run_cold_start(self) -> None:
+        """
+        Run the runner once, keeping its time as the cold start time.
+        """
+        start = time.perf_counter_ns()
+        self.runner()
+        self.cold_start_time = (time.perf_counter_ns() - start) * 1e-9
+
+    def run_batch(self, n: int, time_it: bool = True) -> None:
+        """
+        Run the runner ``n`` times inside a single timer bracket.
+
+        This reads ``time.perf_counter_ns`` directly rather than going
+        through ``timeit``, which otherwise adds a noticeable overhead to
+        the timings of short queries.
+
+        :param n: The number of times to run the runner. Must be at least 1
+         if the runs are timed.
+        :param time_it: Whether to time the runs. If ``False``, the runner
+         is just run ``n`` times.
+        :raises ValueError: If the runs are timed and ``n`` is less than 1.
+        """
+        if not time_it:
+            # Only the first run can be the cold start, so check for it once
+            # rather than on every run
+            if n and self._is_cold:
+                self._run_cold_start()
+                n -= 1
+            runner = self.runner
+            for _ in itertools.repeat(None, n):
+                runner()
+            return
+
+        if n < 1:
+            raise ValueError(f"Can't time a batch of {n} runs.")
+
+        # Keep the first run out of the batch (rather than running the
+        # runner an extra time) so that it still runs exactly `n` times
+        if self._is_cold:
+            self._run_cold_start()
+            n -= 1
+            if not n:
+                return
+
+        # Set up the runner, timer, and loop before starting the clock so
+        # that the timed loop is just the calls to the runner (looping over
+        # `itertools.repeat` like `timeit` does, which is cheaper than
+        # `range` since it doesn't create a new int on each iteration)
+        runner = self.runner
+        perf_counter_ns = time.perf_counter_ns
+        batch = itertools.repeat(None, n)
+        start = perf_counter_ns()
+        for _ in batch:
+            runner()
+        self._record(elapsed_ns=perf_counter_ns() - start, n=n)
+
+    async def arun(self, time_it: bool = True) -> None:
+        """
+        Await the runner, timing it if ``time_it`` is ``True``.
+
+        The runner must return an awaitable, such as the coroutine returned
+        by an ``AsyncDatabaseConnection``'s ``execute`` method.
+
+        :param time_it: Whether to time this run. The first run is always
+         kept as the cold start instead.
+        """
+        if self._is_cold:
+            start = time.perf_counter_ns()
+            await self.runner()
+            self.cold_start_time = (time.perf_counter_ns() - start) * 1e-9
+            return
+
+        if not time_it:
+            await self.runner()
+            return
+
+        start = time.perf_counter_ns()
+        await self.runner()
+        self._record(elapsed_ns=time.perf_counter_ns() - start, n=1)
+
+    def _record(self, elapsed_ns: int, n: int) -> None:
+        """
+        Record a timed batch of ``n`` runs that took ``elapsed_ns``
+        nanoseconds.
+
+        :param elapsed_ns: The time, in nanoseconds, that the batch took.
+        :param n: The number of runs in the batch.
+        """
+        self.total_time_ns += elapsed_ns
+        self.repeat += n
+        self.samples.append(elapsed_ns * 1e-9 / n)
+        self._median_time = None
+        self._stdev_time = None
+
+    def _record_many(self, elapsed_ns: array.array, n: int) -> None:
+        """
+        Record several timed batches of ``n`` runs, each taking the
+        corresponding ``elapsed_ns`` nanoseconds.
+
+        The total is added up as integers, so it's exact however many
+        batches there are.
+
+        :param elapsed_ns: The times, in nanoseconds, that the batches took.
+        :param n: The number of runs in each batch.
+        """
+        self.total_time_ns += sum(elapsed_ns)
+        self.repeat += n * len(elapsed_ns)
+        self.samples.extend([elapsed * 1e-9 / n for elapsed in elapsed_ns])
+        self._median_time = None
+        self._stdev_time = None
+
+    @property
+    def total_time(self) -> float:
+        """
+        The total time, in seconds, that this function has taken to run.
+
+        The total is kept in integer nanoseconds so that adding up lots of
+        short runs doesn't lose precision.
+        """
+        return self.total_time_ns * 1e-9
+
     @property
     def average_time(self) -> float:
         """
@@ -84,126 +349,613 @@ class Runner:
 
         If the function has not been run, returns 0.
         """
-        return _safe_divide(self.total_time, self.repeat)
+        # Inlined `_safe_divide` to save a function call
+        return self.total_time_ns * 1e-9 / self.repeat if self.repeat else 0.0
 
-    def format_runtime(self, total_avg_time: float) -> str:
+    @property
+    def median_time(self) -> float:
         """
-        Return a string containing the name and average time, in seconds, of
+        The median time, in seconds, that this function has taken to run.
+
+        Unlike the average time, this isn't skewed by the odd slow run (like
+        a cold start). If the function has not been run, returns 0.
+
+        This is cached between runs since it needs to sort the samples.
+        """
+        if self._median_time is None:
+            self._median_time = (
+                statistics.median(self.samples) if self.samples else 0.0
+            )
+
+        return self._median_time
+
+    @property
+    def stdev_time(self) -> float:
+        """
+        The (population) standard deviation, in seconds, of the samples of
+        the time that this function has taken to run.
+
+        Each sample is the average run time of a timed batch, so when the
+        batches have more than one run, this is the spread of the batch
+        averages rather than of single runs (about the square root of the
+        batch size smaller). If the function has not been run, returns 0.
+
+        This is cached between runs, and is worked out with ``math.fsum``
+        rather than ``statistics.pstdev`` since the latter uses exact
+        fractions and is slow for large numbers of samples.
+        """
+        if self._stdev_time is None:
+            self._stdev_time = _pstdev(self.samples)
+
+        return self._stdev_time
+
+    def format_runtime(self, total_median_time: float) -> str:
+        """
+        Return a string containing the name, median time, standard
+        deviation, and cold start time (if there was one), in seconds, of
         this runner.
 
-        This will additionally include the average time of this runner as a
-        percentage of the average time of all runners for comparison.
+        This will additionally include the median time of this runner as a
+        percentage of the median time of all runners for comparison. When
+        the runs were timed in batches, the standard deviation is labelled
+        with the (average) batch size since it's the spread of the batch
+        averages rather than of single runs.
 
-        :param total_avg_time: The average time, in seconds, of all runners
-         to use as the denominator for the percentage calculation.
+        :param total_median_time: The total median time, in seconds, of all
+         runners to use as the denominator for the percentage calculation.
         """
-        return f"{self.name}: {self.average_time:.8f}s ({_safe_divide(self.average_time, total_avg_time):.1%})"
+        median_time = self.median_time
+        share = median_time / total_median_time if total_median_time else 0.0
+        batch_size = (
+            round(self.repeat / len(self.samples)) if self.samples else 1
+        )
+        per_batch = f" per {batch_size}-run batch" if batch_size > 1 else ""
+        cold = (
+            ""
+            if self.cold_start_time is None
+            else f" cold={self.cold_start_time:.8f}s"
+        )
+        return f"{self.name}: median={median_time:.8f}s stdev={self.stdev_time:.2e}s{per_batch}{cold} ({share:.1%})"
+
+
+def _scandir_files(
+    directory: Union[str, pathlib.Path],
+) -> List[os.DirEntry]:
+    """
+    Return the directory entries of the files at ``directory``, sorted by
+    name.
+
+    Subdirectories (and their files) are skipped.
+
+    :param directory: The path to the directory whose contents should be
+     read.
+    """
+    # `os.scandir` caches the file type on each entry, which saves a `stat`
+    # call per file compared to `Path.glob` and `Path.is_file`
+    with os.scandir(directory) as entries:
+        files = [entry for entry in entries if entry.is_file()]
+
+    # `os.scandir` returns the entries in whatever order the OS gives them,
+    # so sort them (by their plain string names) for a consistent order
+    files.sort(key=lambda entry: entry.name)
+
+    return files
+
+
+def _warn_about_non_sql_files(non_sql_paths: Tuple[str, ...]) -> None:
+    """
+    Warn about all the ``non_sql_paths`` at once, rather than once per file.
+
+    :param non_sql_paths: The paths of the files that don't look like SQL
+     files.
+    """
+    if non_sql_paths:
+        warnings.warn(
+            f"Files {', '.join(non_sql_paths)} do not end with {' or '.join(map(repr, _SQL_EXTS))}. Non-SQL code might attempt to be executed.",
+            UserWarning,
+        )
 
 
-def _get_query_filepaths(directory: pathlib.Path) -> Generator:
+def _scandir_sql(directory: Union[str, pathlib.Path]) -> Iterator[os.DirEntry]:
+    """
+    Return the directory entries of the files at ``directory``, sorted by
+    name, warning about any files that don't look like SQL files.
+
+    Subdirectories (and their files) are skipped.
+
+    :param directory: The path to the directory whose contents should be
+     read.
+    """
+    files = _scandir_files(directory)
+
+    # Warn before yielding any files so that the warning is raised even if
+    # the caller doesn't consume every file
+    _warn_about_non_sql_files(
+        tuple(
+            entry.path for entry in files if not entry.name.endswith(_SQL_EXTS)
+        )
+    )
+
+    yield from files
+
+
+def _get_query_filepaths(directory: pathlib.Path) -> Iterator[str]:
     """
     Return the full file name paths of the files at ``directory``.
 
+    These are left as strings (rather than ``pathlib.Path`` objects) since
+    they're only used to open the files and name the queries.
+
     :param directory: The path to the directory whose contents should be
      read.
     """
-    for path in directory.glob("*"):
-        if path.is_file():
-            if path.suffix != ".sql":
-                warnings.warn(
-                    f"File {path} does not end with '.sql'. Non-SQL code might attempt to be executed."
-                )
+    for entry in _scandir_sql(directory):
+        yield entry.path
 
-            yield path
+
+@functools.lru_cache(maxsize=32)
+def _cached_query_filepaths(
+    directory: pathlib.Path,
+    mtime_ns: int,
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Return the full file name paths of the files at ``directory``, and of
+    the files that don't look like SQL files, caching the result for
+    repeated calls.
+
+    The directory's modification time is part of the cache key so that
+    adding, removing, or renaming files in the directory invalidates the
+    cached paths. This doesn't warn about the non-SQL files since it's only
+    run when the paths aren't cached, so callers should warn about them.
+
+    :param directory: The path to the directory whose contents should be
+     read.
+    :param mtime_ns: The modification time of the ``directory``, in
+     nanoseconds.
+    :return: The paths of all the files and the paths of the non-SQL files.
+    """
+    files = _scandir_files(directory)
+    return (
+        tuple(entry.path for entry in files),
+        tuple(
+            entry.path for entry in files if not entry.name.endswith(_SQL_EXTS)
+        ),
+    )
+
+
+def _read_text(path: str) -> str:
+    """
+    Return the contents of the file at ``path``.
+
+    :param path: The path to the file to read.
+    """
+    with open(path) as f:
+        return f.read()
 
 
 def _create_query_runners(
     directory: pathlib.Path,
-    db_conn: DatabaseConnection,
+    db_conn: Union[
+        DatabaseConnection,
+        PreparingDatabaseConnection,
+        AsyncDatabaseConnection,
+    ],
+    prepare: bool = False,
 ) -> List[Runner]:
     """
     Return a list of ``Runners`` each corresponding to the files in the
     ``filepath``.
 
+    If ``prepare`` is ``True``, each query is prepared here with the
+    ``db_conn``'s ``prepare`` method and the runners execute the prepared
+    statements. Some DB-API cursors (like ``cx_Oracle``'s) prepare the
+    statement in place and return ``None``, in which case the runners just
+    execute the query as usual.
+
     :param directory: The directory containing the SQL files to be run.
     :param db_conn: The database connection to run the queries against.
+    :param prepare: Whether to prepare each query once up front.
     :return: A list of ``Runner``s each corresponding to the files in the
      ``directory``.
     """
-    # Closures in Python capture _variables_, not _values_, so the `file`
-    # variable by itself would be the last file in the directory for each
-    # lambda. This is why we need to use the variable `f` to 'freeze' the
-    # value of the `file` variable.
+    # The files are read up front (and concurrently, since reading files
+    # releases the GIL) so that the timings don't include the time taken to
+    # read each file from disk on every run.
+    files, non_sql_files = _cached_query_filepaths(
+        directory=directory,
+        mtime_ns=directory.stat().st_mtime_ns,
+    )
+    _warn_about_non_sql_files(non_sql_files)
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(32, len(files) or 1)
+    ) as executor:
+        queries = list(executor.map(_read_text, files))
+
+    # The runners are bound methods (or partials of them) rather than
+    # lambdas so that each run doesn't need to look up `execute` again, and
+    # so that each runner holds onto its own query rather than the loop
+    # variable:
     #
     # https://docs.python.org/3/faq/programming.html#why-do-lambdas-defined-in-a-loop-with-different-values-all-return-the-same-result
-    return [
-        Runner(
-            runner=lambda f=file: db_conn.execute(f.read_text()),
-            name=file.name,
-        )
-        for file in _get_query_filepaths(directory)
+    runners = []
+    for file, sql in zip(files, queries):
+        statement = db_conn.prepare(sql) if prepare else None
+        if statement is None:
+            runner = functools.partial(db_conn.execute, sql)
+        else:
+            runner = statement.execute
+        runners.append(Runner(runner=runner, name=os.path.basename(file)))
+
+    return runners
+
+
+def _calibrate_number(runner: Runner) -> int:
+    """
+    Return the number of runs of the ``runner`` that should be timed
+    together so that each timed batch takes roughly
+    ``_CALIBRATION_TARGET_TIME`` seconds.
+
+    This runs the ``runner`` once (untimed, as far as the ``runner`` is
+    concerned) to estimate how long a single run takes. Slow runners will
+    always get a batch size of 1, and runners too fast for the timer to
+    measure get a batch size of ``_MAX_CALIBRATED_NUMBER``.
+
+    :param runner: The ``Runner`` to calibrate.
+    :return: The number of runs to time together, between 1 and
+     ``_MAX_CALIBRATED_NUMBER``.
+    """
+    elapsed = timeit.timeit(runner.runner, number=1)
+    if elapsed <= 0:
+        return _MAX_CALIBRATED_NUMBER
+
+    return max(
+        1,
+        min(_MAX_CALIBRATED_NUMBER, int(_CALIBRATION_TARGET_TIME / elapsed)),
+    )
+
+
+def _warm_up(runner: Runner, max_warmup: int = _MAX_WARMUP) -> int:
+    """
+    Run the ``runner`` (untimed) until its run time stops decreasing, up to
+    ``max_warmup`` times.
+
+    :param runner: The ``Runner`` to warm up.
+    :param max_warmup: The most times to run the ``runner``.
+    :return: The number of times the ``runner`` was run.
+    """
+    runner_callable = runner.runner
+    last_elapsed = math.inf
+    for i in range(1, max_warmup + 1):
+        start = time.perf_counter_ns()
+        runner_callable()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= last_elapsed:
+            return i
+        last_elapsed = elapsed
+
+    return max_warmup
+
+
+def _warn_about_slow_first_runs(runners: List[Runner]) -> None:
+    """
+    Warn about the ``runners`` whose first timed run (after the warmup runs)
+    was much slower than their median run.
+
+    :param runners: The list of ``Runner``s to check.
+    """
+    for runner in runners:
+        if not runner.samples:
+            continue
+
+        ratio = _safe_divide(runner.samples[0], runner.median_time)
+        if ratio > _FIRST_RUN_WARNING_RATIO:
+            warnings.warn(
+                f"The first timed run of {runner.name} took {ratio:.1f}x longer than its median run after {runner.warmup_runs} warmup run(s), so the timings might have been affected by caching effects: consider increasing `warmup`."
+            )
+
+
+def _run_each(
+    funcs: List[Callable[[], Any]],
+    executors: Optional[List[concurrent.futures.Executor]] = None,
+) -> List[Any]:
+    """
+    Call each of the ``funcs`` and return their results.
+
+    If ``executors`` are given, each function is submitted to the
+    corresponding executor (so the functions run at the same time) and this
+    waits for them all to finish.
+
+    :param funcs: The functions to call.
+    :param executors: The executors to call the ``funcs`` in, one per
+     function. If ``None``, the ``funcs`` are called one after the other.
+    :return: The results of the ``funcs``, in the same order.
+    """
+    if executors is None:
+        return [func() for func in funcs]
+
+    futures = [
+        executor.submit(func) for executor, func in zip(executors, funcs)
     ]
+    return [future.result() for future in futures]
+
+
+def _time_runners(
+    runners: List[Runner],
+    repeat: int,
+    numbers: List[int],
+) -> None:
+    """
+    Time the ``runners`` ``repeat`` times, one after the other.
+
+    :param runners: The list of ``Runner``s to time.
+    :param repeat: The number of times to time the ``runners``.
+    :param numbers: The number of runs of each runner to time together in
+     each of the ``repeat`` iterations.
+    """
+    # The timed loop works off plain lists and arrays (indexed by runner)
+    # and local names rather than the `Runner` objects to keep attribute
+    # lookups out of it; the timings are added to the runners afterwards
+    callables = [runner.runner for runner in runners]
+    elapsed_ns = [array.array("q") for _ in runners]
+    indexes = range(len(runners))
+    perf_counter_ns = time.perf_counter_ns
 
+    # Keep running them 'side-by-side' to account for database traffic
+    for _ in tqdm.trange(repeat):
+        for i in indexes:
+            runner_callable = callables[i]
+            batch = itertools.repeat(None, numbers[i])
+            start = perf_counter_ns()
+            for _ in batch:
+                runner_callable()
+            elapsed_ns[i].append(perf_counter_ns() - start)
 
-def _run_runners(runners: List[Runner], repeat: int) -> None:
+    for runner, runner_number, runner_elapsed_ns in zip(
+        runners, numbers, elapsed_ns
+    ):
+        runner._record_many(elapsed_ns=runner_elapsed_ns, n=runner_number)
+
+
+def _time_runners_in_threads(
+    runners: List[Runner],
+    repeat: int,
+    numbers: List[int],
+    executors: List[concurrent.futures.Executor],
+) -> None:
+    """
+    Time the ``runners`` ``repeat`` times, running the ``runners`` in
+    separate threads within each iteration.
+
+    :param runners: The list of ``Runner``s to time.
+    :param repeat: The number of times to time the ``runners``.
+    :param numbers: The number of runs of each runner to time together in
+     each of the ``repeat`` iterations.
+    :param executors: The single-thread executors to run the ``runners``
+     in, one per runner.
+    """
+    # Look up the methods once rather than on every iteration
+    batches = [
+        (executor.submit, runner.run_batch, runner_number)
+        for executor, runner, runner_number in zip(executors, runners, numbers)
+    ]
+    for _ in tqdm.trange(repeat):
+        futures = [
+            submit(run_batch, runner_number)
+            for submit, run_batch, runner_number in batches
+        ]
+        for future in futures:
+            future.result()
+
+
+def _run_runners(
+    runners: List[Runner],
+    repeat: int,
+    warmup: Optional[int] = 1,
+    number: Optional[int] = 1,
+    parallel: bool = False,
+) -> None:
     """
     Run the ``runners`` ``repeat`` times.
 
     This will always run the runners once before the repeat loop to set up
     the temp tables in the database (there's no way to avoid these implicit
-    tables).
+    tables), and then a further ``warmup`` times so that the timed runs
+    aren't skewed by cold caches.
+
+    :param runners: The list of ``Runner``s to run.
+    :param repeat: The number of times to run the ``runners``.
+    :param warmup: The number of untimed runs of the ``runners`` to make
+     after setting up the temp tables and before the timed runs. If
+     ``None``, each runner is run until its run time stops decreasing (up
+     to ``_MAX_WARMUP`` times).
+    :param number: The number of runs of each runner to time together in
+     each of the ``repeat`` iterations. If ``None``, this is calibrated for
+     each runner so that very fast queries aren't dominated by the timing
+     overhead.
+    :param parallel: Whether to run the ``runners`` in separate threads
+     within each of the ``repeat`` iterations. Each runner gets its own
+     thread, which is also used for its untimed runs, so that anything the
+     runner sets up per thread (like a database connection) is set up
+     before the timed runs.
+    :raises ValueError: If ``number`` is less than 1.
+    """
+    if number is not None and number < 1:
+        raise ValueError(f"`number` must be at least 1, not {number}.")
+
+    with contextlib.ExitStack() as stack:
+        executors = None
+        if parallel and len(runners) > 1:
+            executors = [
+                stack.enter_context(
+                    concurrent.futures.ThreadPoolExecutor(max_workers=1)
+                )
+                for _ in runners
+            ]
+
+        # Set the 'temp' tables
+        _run_each([runner.run_untimed for runner in runners], executors)
+
+        # Warm up the database (and interpreter) caches
+        if warmup is None:
+            warmup_runs = _run_each(
+                [functools.partial(_warm_up, runner) for runner in runners],
+                executors,
+            )
+        else:
+            # The cold starts were taken when setting the 'temp' tables, so
+            # the runner callables can be run directly
+            callables = [runner.runner for runner in runners]
+            for _ in range(warmup):
+                _run_each(callables, executors)
+            warmup_runs = [warmup] * len(runners)
+        for runner, runner_warmup_runs in zip(runners, warmup_runs):
+            runner.warmup_runs = runner_warmup_runs
+
+        numbers = [number] * len(runners)
+        if number is None:
+            numbers = _run_each(
+                [
+                    functools.partial(_calibrate_number, runner)
+                    for runner in runners
+                ],
+                executors,
+            )
+
+        # Like `timeit`, turn off garbage collection while timing so that a
+        # collection doesn't land in the middle of a run
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if executors is None:
+                _time_runners(runners=runners, repeat=repeat, numbers=numbers)
+            else:
+                _time_runners_in_threads(
+                    runners=runners,
+                    repeat=repeat,
+                    numbers=numbers,
+                    executors=executors,
+                )
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    _warn_about_slow_first_runs(runners)
+
+
+async def _arun_runners(
+    runners: List[Runner],
+    repeat: int,
+    warmup: int = 1,
+) -> None:
+    """
+    Run the asynchronous ``runners`` ``repeat`` times, running the
+    ``runners`` concurrently within each iteration.
+
+    Like ``_run_runners``, this will always run the runners once (one at a
+    time) before the repeat loop to set up the temp tables in the database,
+    and then a further ``warmup`` times before the timed runs.
 
     :param runners: The list of ``Runner``s to run.
     :param repeat: The number of times to run the ``runners``.
+    :param warmup: The number of untimed runs of the ``runners`` to make
+     after setting up the temp tables and before the timed runs.
     """
     # Set the 'temp' tables
     for runner in runners:
-        runner(time_it=False)
+        await runner.arun(time_it=False)
 
-    # Keep running them 'side-by-side' to account for database traffic
+    # Warm up the database (and interpreter) caches
+    for _ in range(warmup):
+        await asyncio.gather(
+            *(runner.arun(time_it=False) for runner in runners)
+        )
+    for runner in runners:
+        runner.warmup_runs = warmup
+
+    # Look up the methods once rather than on every iteration
+    aruns = [runner.arun for runner in runners]
     for _ in tqdm.trange(repeat):
-        for runner in runners:
-            runner()
+        await asyncio.gather(*[arun() for arun in aruns])
 
 
 def _print_runner_stats(runners: List[Runner]) -> None:
     """
-    Print the average run times of the ``runners``.
+    Print the median run times of the ``runners``.
 
     :param runners: The list of ``Runner``s to run.
     """
-    total_avg_time = sum(runner.average_time for runner in runners)
-    for runner in runners:
-        print(runner.format_runtime(total_avg_time))
+    total_median_time = math.fsum([runner.median_time for runner in runners])
+    lines = [
+        f"{runner.format_runtime(total_median_time)}\n" for runner in runners
+    ]
+
+    # Write all the lines at once rather than a `print` per runner
+    sys.stdout.write("".join(lines))
 
 
-def _print_times() -> Callable:
+def _print_start_time() -> None:
+    """
+    Print the current time as the start time, followed by a divider.
+    """
+    sys.stdout.write(f"Start time: {time.strftime(_TIME_FORMAT)}\n{40 * '-'}\n")
+
+
+def _print_end_time() -> None:
+    """
+    Print a divider, followed by the current time as the end time.
+    """
+    sys.stdout.write(f"{40 * '-'}\nEnd time: {time.strftime(_TIME_FORMAT)}\n")
+
+
+def _print_times(func: Callable) -> Callable:
     """
     Print the start and end times of the wrapped function.
     """
+    if inspect.iscoroutinefunction(func):
 
-    def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
-        def wrapper(*args, **kwargs) -> Any:
-            print(f"Start time: {datetime.datetime.now()}")
-            print(40 * "-")
-            func(*args, **kwargs)
-            print(40 * "-")
-            print(f"End time: {datetime.datetime.now()}")
+        async def async_wrapper(*args, **kwargs) -> Any:
+            _print_start_time()
+            await func(*args, **kwargs)
+            _print_end_time()
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        _print_start_time()
+        func(*args, **kwargs)
+        _print_end_time()
+
+    return wrapper
+
+
+def _to_directory(directory: Union[str, pathlib.Path]) -> pathlib.Path:
+    """
+    Return the ``directory`` as a path, raising an error if it doesn't
+    exist.
 
-        return wrapper
+    :param directory: The path to the directory containing the SQL queries.
+    """
+    directory = pathlib.Path(directory)
+    if not directory.exists():
+        raise FileNotFoundError(f"Directory '{directory}' does not exist.")
 
-    return decorator
+    return directory
 
 
-@_print_times()
-def time_queries(
+@_print_times
+def time_queries(  # noqa: PLR0913
     # This API is likely to change in the future, so requiring kwargs makes
     # changes to the API less likely to break downstream usage in the future
     *,
-    conn: DatabaseConnection,
+    conn: Union[DatabaseConnection, PreparingDatabaseConnection],
     repeat: int,
     directory: Union[str, pathlib.Path],
+    warmup: Optional[int] = 1,
+    number: Optional[int] = 1,
+    parallel: bool = False,
+    prepare: bool = False,
 ) -> None:
     """
     Time the SQL queries in the directory and print the results.
@@ -222,20 +974,99 @@ def time_queries(
             )
 
     :param conn: The database connector. Must implement an ``execute``
-     method.
+     method, and also a ``prepare`` method returning statements that
+     implement an ``execute`` method if ``prepare`` is ``True``.
     :param repeat: The number of times to run each query. Note that the
      queries will all be run once before the repeat loop to set up the temp
      tables in the database (there's no way to avoid these implicit tables).
     :param directory: The path to the directory containing the SQL queries.
+    :param warmup: The number of untimed runs of each query to make after
+     setting up the temp tables and before the timed runs. If ``None``,
+     each query is run until its run time stops decreasing (up to 16
+     times). Defaults to 1.
+    :param number: The number of runs of each query to time together in
+     each of the ``repeat`` iterations, with the time per run being the
+     batch time divided by ``number``. If ``None``, this is calibrated
+     for each query so that each batch takes around 10ms, which helps
+     stop the timing overhead drowning out very fast queries. The
+     reported standard deviation is then the spread of the batch averages
+     (labelled with the batch size), not of single runs. Must be at
+     least 1 if given. Defaults to 1.
+    :param parallel: Whether to run the queries in separate threads within
+     each of the ``repeat`` iterations, which overlaps the time spent
+     waiting on the database. Each query gets its own thread, which also
+     runs its untimed runs. Each thread needs its own database connection,
+     so the ``conn`` should run each query on a connection for the current
+     thread (for example, using ``threading.local``): sharing a single
+     connection between the threads won't overlap the queries. Defaults
+     to ``False``.
+    :param prepare: Whether to prepare each query once with the ``conn``'s
+     ``prepare`` method and time the prepared statement's ``execute``
+     method, so that the timings don't include parsing and planning the
+     query. If ``prepare`` returns ``None`` (like DB-API cursors that
+     prepare in place), the ``conn``'s ``execute`` method is timed as
+     usual. Defaults to ``False``.
     """
-    directory = pathlib.Path(directory)
-    if not directory.exists():
-        raise FileNotFoundError(f"Directory '{directory}' does not exist.")
+    runners: List[Runner] = _create_query_runners(
+        directory=_to_directory(directory),
+        db_conn=conn,
+        prepare=prepare,
+    )
+
+    _run_runners(
+        runners=runners,
+        repeat=repeat,
+        warmup=warmup,
+        number=number,
+        parallel=parallel,
+    )
+    _print_runner_stats(runners=runners)
 
+
+@_print_times
+async def time_queries_async(
+    *,
+    conn: AsyncDatabaseConnection,
+    repeat: int,
+    directory: Union[str, pathlib.Path],
+    warmup: int = 1,
+) -> None:
+    """
+    Time the SQL queries in the directory, running them concurrently, and
+    print the results.
+
+    This is the asynchronous counterpart to ``time_queries`` for database
+    drivers with an ``async`` ``execute`` method. Within each of the
+    ``repeat`` iterations the queries are run concurrently, which overlaps
+    the time spent waiting on the database. Note that the database itself
+    may still run the queries one at a time, so the timings can include
+    time spent waiting for the other queries::
+
+        import asyncio
+
+        from db_query_profiler import time_queries_async
+
+        asyncio.run(
+            time_queries_async(
+                conn=your_async_database_connection,
+                repeat=10,
+                directory="path/to/your/sql/files",
+            )
+        )
+
+    :param conn: The asynchronous database connector. Must implement an
+     ``async`` ``execute`` method.
+    :param repeat: The number of times to run each query. Note that the
+     queries will all be run once before the repeat loop to set up the temp
+     tables in the database (there's no way to avoid these implicit tables).
+    :param directory: The path to the directory containing the SQL queries.
+    :param warmup: The number of untimed runs of each query to make after
+     setting up the temp tables and before the timed runs. Defaults to 1.
+    """
     runners: List[Runner] = _create_query_runners(
-        directory=directory,
+        directory=_to_directory(directory),
         db_conn=conn,
     )
 
-    _run_runners(runners=runners, repeat=repeat)
+    await _arun_runners(runners=runners, repeat=repeat, warmup=warmup)
     _print_runner_stats(runners=runners)
@@ -2,17 +2,125 @@
 Unit tests for the ``db_query_profiler.query_timer`` module.
 """
 
+import array
+import asyncio
 import contextlib
+import gc
 import io
+import os
 import re
 import sqlite3
+import statistics
+import threading
+import time
+import warnings
 from pathlib import Path
+from typing import Optional
 
 import pytest
 
 from db_query_profiler import query_timer
 
 
+class AsyncConnection:
+    """
+    Asynchronous wrapper around a SQLite connection.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    async def execute(self, sql: str) -> sqlite3.Cursor:
+        return self.conn.execute(sql)
+
+
+class RecordingConnection:
+    """
+    Database connection that records the SQL it's asked to execute.
+    """
+
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, sql: str) -> None:
+        self.executed.append(sql)
+
+
+class CallCounter:
+    """
+    Function that counts how many times it's been called.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self) -> None:
+        self.calls += 1
+
+
+class InPlacePreparingConnection(RecordingConnection):
+    """
+    DB-API style cursor that prepares statements in place (returning
+    ``None``), like ``cx_Oracle``'s cursors.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.prepared = []
+
+    def prepare(self, sql: str) -> None:
+        self.prepared.append(sql)
+
+
+class PreparingConnection:
+    """
+    SQLite connection wrapper that "prepares" statements and counts how
+    many times they're prepared and executed.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.prepared = 0
+        self.executed = 0
+
+    def prepare(self, sql: str) -> "PreparingConnection":
+        self.prepared += 1
+        self.sql = sql
+        return self
+
+    def execute(self) -> sqlite3.Cursor:
+        self.executed += 1
+        return self.conn.execute(self.sql)
+
+
+class ThreadLocalConnection:
+    """
+    SQLite connection wrapper that opens a separate connection (with a
+    ``sleep`` function) for each thread that runs a query, and counts how
+    many connections it's opened.
+    """
+
+    def __init__(self, database: Path):
+        self.database = database
+        self.local = threading.local()
+        self.connections = 0
+
+    def execute(self, sql: str) -> sqlite3.Cursor:
+        if not hasattr(self.local, "conn"):
+            self.local.conn = sqlite3.connect(self.database)
+            self.local.conn.create_function("sleep", 1, time.sleep)
+            self.connections += 1
+        return self.local.conn.execute(sql)
+
+
+@pytest.fixture
+def async_runner():
+    async def runner():
+        await asyncio.sleep(0)
+
+    return query_timer.Runner(runner=runner, name="query-1.sql")
+
+
 @pytest.fixture
 def runner_1():
     return query_timer.Runner(
@@ -29,20 +137,19 @@ def runner_2():
     )
 
 
+@pytest.fixture
+def counting_runner():
+    return query_timer.Runner(
+        runner=CallCounter(),
+        name="query-1.sql",
+    )
+
+
 def test__runner__repr(runner_1: query_timer.Runner):
     """
     Test the Runner's ``__repr__`` method.
-
-    This should test that Runner's ``__repr__`` creates an identical object,
-    but passing in a lambda/partial is making this fiddly. Instead, this
-    just tests the returned ``__repr__`` pattern.
     """
-    expected = re.compile(
-        r"Runner\(runner=<function runner_1\.<locals>\.<lambda> at 0x[a-zA-Z0-9]+>, name='query-1\.sql'\)"
-    )
-    actual = repr(runner_1)
-
-    assert expected.match(actual)
+    assert repr(runner_1) == "Runner(name='query-1.sql')"
 
 
 def test__runner__str(runner_1: query_timer.Runner):
@@ -54,6 +161,23 @@ def test__runner__str(runner_1: query_timer.Runner):
     assert str(runner_1) == expected
 
 
+def test__runner__str__without_signature():
+    """
+    Test the Runner's ``__str__`` method for a runner whose signature can't
+    be inspected.
+    """
+    runner = query_timer.Runner(runner=dict, name="query-1.sql")
+
+    assert str(runner) == "Runner(runner=<class 'dict'>, name=query-1.sql)"
+
+
+def test__runner__slots(runner_1: query_timer.Runner):
+    """
+    Test that the Runner doesn't have an instance ``__dict__``.
+    """
+    assert not hasattr(runner_1, "__dict__")
+
+
 def test__runner__call_without_timeit(runner_1: query_timer.Runner):
     """
     Test that calling a Runner without ``time_it`` doesn't change the
@@ -69,16 +193,96 @@ def test__runner__call_with_timeit(runner_1: query_timer.Runner):
     """
     Test that calling a Runner with ``time_it`` changes the property values.
     """
+    runner_1.run_untimed()  # The cold start
     runner_1(time_it=True)
 
     assert runner_1.repeat == 1
     assert runner_1.total_time > 0
 
 
+def test__runner__run_timed_and_untimed(runner_1: query_timer.Runner):
+    """
+    Test that only the Runner's ``run_timed`` method changes the property
+    values.
+    """
+    runner_1.run_untimed()
+    runner_1.run_untimed()
+
+    assert runner_1.repeat == 0
+    assert runner_1.total_time == 0
+
+    runner_1.run_timed()
+
+    assert runner_1.repeat == 1
+    assert runner_1.total_time > 0
+
+
+def test__runner__cold_start(runner_1: query_timer.Runner):
+    """
+    Test that the first run of a Runner is kept out of its statistics.
+    """
+    runner_1(time_it=False)
+
+    assert runner_1.cold_start_time > 0
+    assert runner_1.repeat == 0
+
+    cold_start_time = runner_1.cold_start_time
+    runner_1(time_it=True)
+
+    assert runner_1.cold_start_time == cold_start_time
+    assert runner_1.repeat == 1
+
+
+def test__runner__cold_start_when_timed(counting_runner: query_timer.Runner):
+    """
+    Test that a Runner keeps its first run as the cold start, rather than
+    running an extra time, when its first run is timed.
+    """
+    counting_runner(time_it=True)
+
+    assert counting_runner.runner.calls == 1
+    assert counting_runner.cold_start_time > 0
+    assert counting_runner.repeat == 0
+
+    counting_runner(time_it=True)
+
+    assert counting_runner.runner.calls == 2
+    assert counting_runner.repeat == 1
+
+
+def test__runner__without_exclude_first(counting_runner: query_timer.Runner):
+    """
+    Test that a Runner doesn't keep the first run out of its statistics
+    when ``exclude_first`` is ``False``.
+    """
+    counting_runner.exclude_first = False
+    counting_runner(time_it=True)
+
+    assert counting_runner.runner.calls == 1
+    assert counting_runner.cold_start_time is None
+    assert counting_runner.repeat == 1
+
+
+@pytest.mark.parametrize("number", [0, -1])
+def test__runner__call_with_invalid_number(
+    runner_1: query_timer.Runner, number: int
+):
+    """
+    Test that timing a batch of fewer than one run raises an error without
+    changing the property values.
+    """
+    with pytest.raises(ValueError):
+        runner_1(time_it=True, number=number)
+
+    assert runner_1.repeat == 0
+    assert runner_1.total_time == 0
+
+
 def test__runner__average_time(runner_1: query_timer.Runner):
     """
     Test the Runner's ``average_time`` computation.
     """
+    runner_1.run_untimed()  # The cold start
     for _ in range(3):
         runner_1(time_it=True)
 
@@ -86,6 +290,83 @@ def test__runner__average_time(runner_1: query_timer.Runner):
     assert runner_1.average_time == (runner_1.total_time / runner_1.repeat)
 
 
+def test__runner__median_and_stdev_time(runner_1: query_timer.Runner):
+    """
+    Test the Runner's ``median_time`` and ``stdev_time`` computations.
+    """
+    assert runner_1.median_time == 0
+    assert runner_1.stdev_time == 0
+
+    for elapsed_ns in [100_000_000, 200_000_000, 900_000_000]:
+        runner_1._record(elapsed_ns=elapsed_ns, n=1)
+
+    assert runner_1.median_time == 0.2
+    assert runner_1.stdev_time == pytest.approx(0.355903, rel=1e-5)
+
+
+def test__runner__record_many(runner_1: query_timer.Runner):
+    """
+    Test that recording several batches at once matches recording them one
+    at a time.
+    """
+    elapsed_ns = array.array("q", [100_000_000, 200_000_001, 900_000_003])
+    runner_1._record_many(elapsed_ns=elapsed_ns, n=2)
+
+    expected = query_timer.Runner(runner=lambda: None, name="query-1.sql")
+    for elapsed in elapsed_ns:
+        expected._record(elapsed_ns=elapsed, n=2)
+
+    assert runner_1.total_time_ns == 1_200_000_004
+    assert runner_1.total_time_ns == expected.total_time_ns
+    assert runner_1.repeat == expected.repeat == 6
+    assert runner_1.samples == expected.samples
+
+
+def test__runner__run_batch(counting_runner: query_timer.Runner):
+    """
+    Test that running a batch of a Runner counts each run in the batch,
+    apart from the cold start.
+    """
+    counting_runner.run_batch(5)
+
+    assert counting_runner.runner.calls == 5
+    assert counting_runner.repeat == 4
+    assert counting_runner.total_time > 0
+    assert counting_runner.total_time == counting_runner.total_time_ns * 1e-9
+
+
+def test__runner__arun(async_runner: query_timer.Runner):
+    """
+    Test that awaiting a Runner's ``arun`` only changes the property values
+    when it's timed.
+    """
+    asyncio.run(async_runner.arun(time_it=False))
+
+    assert async_runner.repeat == 0
+    assert async_runner.total_time == 0
+    assert async_runner.cold_start_time > 0
+
+    asyncio.run(async_runner.arun(time_it=True))
+
+    assert async_runner.repeat == 1
+    assert async_runner.total_time > 0
+
+
+def test__runner__run_batch_without_timeit(
+    counting_runner: query_timer.Runner,
+):
+    """
+    Test that running an untimed batch of a Runner runs it ``n`` times
+    without changing the property values.
+    """
+    counting_runner.run_batch(5, time_it=False)
+
+    assert counting_runner.runner.calls == 5
+    assert counting_runner.repeat == 0
+    assert counting_runner.total_time == 0
+    assert counting_runner.cold_start_time > 0
+
+
 @pytest.mark.parametrize(
     "numerator, denominator, expected",
     [
@@ -101,17 +382,36 @@ def test__safe_divide(numerator: float, denominator: float, expected: float):
     assert query_timer._safe_divide(numerator, denominator) == expected
 
 
+@pytest.mark.parametrize(
+    "data",
+    [
+        [],
+        [1.0],
+        [0.1, 0.2, 0.9],
+        [1e-6, 2e-6, 1.5],
+    ],
+)
+def test__pstdev(data: list):
+    """
+    Test the ``_pstdev`` function.
+    """
+    expected = statistics.pstdev(data) if data else 0.0
+    actual = query_timer._pstdev(array.array("d", data))
+
+    assert actual == pytest.approx(expected)
+
+
 def test__get_query_filepaths(directory: Path):
     """
     Test the ``_get_query_filepaths`` function.
     """
     expected = [
-        directory / "query-1.sql",
-        directory / "query-2.sql",
+        str(directory / "query-1.sql"),
+        str(directory / "query-2.sql"),
     ]
     actual = list(query_timer._get_query_filepaths(directory))
 
-    assert sorted(actual) == sorted(expected)
+    assert actual == expected
 
 
 def test__get_query_filepaths__with_warning(directory: Path):
@@ -127,29 +427,209 @@ def test__get_query_filepaths__with_warning(directory: Path):
     file_path.unlink()
 
 
-def test__create_query_runners(
-    db_connection: sqlite3.Connection, directory: Path
-):
+def test__get_query_filepaths__with_one_warning(tmp_path: Path):
+    """
+    Test that the ``_get_query_filepaths`` function raises a single warning
+    for all the non-SQL files.
+    """
+    (tmp_path / "query-1.sql").touch()
+    (tmp_path / "temp-1.py").touch()
+    (tmp_path / "temp-2.py").touch()
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        actual = list(query_timer._get_query_filepaths(tmp_path))
+
+    assert len(actual) == 3
+    assert len(caught) == 1
+    assert "temp-1.py" in str(caught[0].message)
+    assert "temp-2.py" in str(caught[0].message)
+
+
+def test__get_query_filepaths__warns_before_yielding(tmp_path: Path):
+    """
+    Test that the ``_get_query_filepaths`` function raises its warning
+    before yielding the first file.
+    """
+    (tmp_path / "query-1.sql").touch()
+    (tmp_path / "temp.py").touch()
+
+    with pytest.warns(UserWarning):
+        next(query_timer._get_query_filepaths(tmp_path))
+
+
+def test__cached_query_filepaths(tmp_path: Path):
+    """
+    Test that the ``_cached_query_filepaths`` function caches the paths
+    until the directory changes.
+    """
+    (tmp_path / "query-1.sql").touch()
+    first = query_timer._cached_query_filepaths(
+        tmp_path, tmp_path.stat().st_mtime_ns
+    )
+    second = query_timer._cached_query_filepaths(
+        tmp_path, tmp_path.stat().st_mtime_ns
+    )
+
+    assert first is second
+    assert first == ((str(tmp_path / "query-1.sql"),), ())
+
+    (tmp_path / "query-2.sql").touch()
+    (tmp_path / "temp.py").touch()
+    os.utime(tmp_path, ns=(0, tmp_path.stat().st_mtime_ns + 1))
+    third = query_timer._cached_query_filepaths(
+        tmp_path, tmp_path.stat().st_mtime_ns
+    )
+
+    assert third == (
+        (
+            str(tmp_path / "query-1.sql"),
+            str(tmp_path / "query-2.sql"),
+            str(tmp_path / "temp.py"),
+        ),
+        (str(tmp_path / "temp.py"),),
+    )
+
+
+def test__create_query_runners(tmp_path: Path):
     """
     Test the ``_create_query_runners`` function.
     """
+    (tmp_path / "query-2.sql").write_text("SELECT 2")
+    (tmp_path / "query-1.sql").write_text("SELECT 1")
+    conn = RecordingConnection()
     actual = query_timer._create_query_runners(
-        directory=directory,
-        db_conn=db_connection,
+        directory=tmp_path,
+        db_conn=conn,
     )
-    expected = [
-        f"""Runner(runner=[[OrderedDict([('f', <Parameter "f={repr(directory / 'query-1.sql')}">)])], <class 'inspect._empty'>], name=query-1.sql)""",  # noqa
-        f"""Runner(runner=[[OrderedDict([('f', <Parameter "f={repr(directory / 'query-2.sql')}">)])], <class 'inspect._empty'>], name=query-2.sql)""",  # noqa
+
+    assert sorted(runner.name for runner in actual) == [
+        "query-1.sql",
+        "query-2.sql",
+    ]
+
+    for runner in actual:
+        runner.runner()
+
+    assert sorted(conn.executed) == ["SELECT 1", "SELECT 2"]
+    assert conn.executed == [
+        (tmp_path / runner.name).read_text() for runner in actual
     ]
 
-    # fmt: off
-    assert ([
-        str(runner) for runner in actual].sort()
-        == [str(runner) for runner in expected].sort()
+
+def test__create_query_runners__warns_every_time(
+    db_connection: sqlite3.Connection, tmp_path: Path
+):
+    """
+    Test that the ``_create_query_runners`` function warns about non-SQL
+    files every time it's called, even when the file paths are cached.
+    """
+    (tmp_path / "query-1.sql").write_text("SELECT 1")
+    (tmp_path / "temp.py").write_text("SELECT 2")
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        for _ in range(2):
+            query_timer._create_query_runners(
+                directory=tmp_path,
+                db_conn=db_connection,
+            )
+
+    assert len(caught) == 2
+    assert all("temp.py" in str(warning.message) for warning in caught)
+
+
+def test__create_query_runners__empty_directory(
+    db_connection: sqlite3.Connection, tmp_path: Path
+):
+    """
+    Test that the ``_create_query_runners`` function returns no runners for
+    an empty directory.
+    """
+    actual = query_timer._create_query_runners(
+        directory=tmp_path,
+        db_conn=db_connection,
     )
-    # fmt: on
+
+    assert actual == []
 
 
+def test__create_query_runners__reads_files_once(
+    db_connection: sqlite3.Connection, tmp_path: Path
+):
+    """
+    Test that the ``_create_query_runners`` function reads the files when
+    the runners are created rather than every time they are run.
+    """
+    file_path = tmp_path / "query-1.sql"
+    file_path.write_text("SELECT 1")
+    runners = query_timer._create_query_runners(
+        directory=tmp_path,
+        db_conn=db_connection,
+    )
+    file_path.unlink()
+
+    runners[0].run_untimed()
+    runners[0](time_it=True)
+
+    assert runners[0].repeat == 1
+
+
+def test__create_query_runners__with_prepare(
+    db_connection: sqlite3.Connection, tmp_path: Path
+):
+    """
+    Test that the ``_create_query_runners`` function prepares the queries
+    once when the connection supports it.
+    """
+    (tmp_path / "query-1.sql").write_text("SELECT 1")
+    conn = PreparingConnection(db_connection)
+    runners = query_timer._create_query_runners(
+        directory=tmp_path,
+        db_conn=conn,
+        prepare=True,
+    )
+    for _ in range(3):
+        runners[0](time_it=True)
+
+    assert conn.prepared == 1
+    assert conn.executed == 3
+    assert runners[0].repeat == 2  # Excluding the cold start
+
+
+def test__create_query_runners__without_prepare(
+    db_connection: sqlite3.Connection, tmp_path: Path
+):
+    """
+    Test that the ``_create_query_runners`` function doesn't prepare the
+    queries unless asked to.
+    """
+    (tmp_path / "query-1.sql").write_text("SELECT 1")
+    conn = PreparingConnection(db_connection)
+    query_timer._create_query_runners(directory=tmp_path, db_conn=conn)
+
+    assert conn.prepared == 0
+
+
+def test__create_query_runners__with_prepare_in_place(tmp_path: Path):
+    """
+    Test that the ``_create_query_runners`` function executes the queries
+    as usual when the connection's ``prepare`` method returns ``None``.
+    """
+    (tmp_path / "query-1.sql").write_text("SELECT 1")
+    conn = InPlacePreparingConnection()
+    runners = query_timer._create_query_runners(
+        directory=tmp_path,
+        db_conn=conn,
+        prepare=True,
+    )
+    runners[0].runner()
+
+    assert conn.prepared == ["SELECT 1"]
+    assert conn.executed == ["SELECT 1"]
+
+
+@pytest.mark.filterwarnings("ignore:The first timed run")
 def test__run_runners(
     runner_1: query_timer.Runner, runner_2: query_timer.Runner
 ):
@@ -167,13 +647,293 @@ def test__run_runners(
     assert runner_2.total_time > 0
 
 
+@pytest.mark.filterwarnings("ignore:The first timed run")
+def test__run_runners__restores_gc(runner_1: query_timer.Runner):
+    """
+    Test that the ``_run_runners`` function turns garbage collection back
+    on after the timed runs.
+    """
+    query_timer._run_runners(runners=[runner_1], repeat=1)
+
+    assert gc.isenabled()
+
+
+@pytest.mark.filterwarnings("ignore:The first timed run")
+def test__run_runners__in_parallel(
+    runner_1: query_timer.Runner, runner_2: query_timer.Runner
+):
+    """
+    Test the ``_run_runners`` function when running the runners in
+    separate threads.
+    """
+    query_timer._run_runners(
+        runners=[runner_1, runner_2],
+        repeat=3,
+        parallel=True,
+    )
+
+    assert runner_1.repeat == 3
+    assert runner_2.repeat == 3
+    assert runner_1.total_time > 0
+    assert runner_2.total_time > 0
+
+
+def test__run_runners__in_parallel_with_database(tmp_path: Path):
+    """
+    Test the ``_run_runners`` function when running real queries in
+    separate threads, each with its own database connection.
+    """
+    queries = tmp_path / "queries"
+    queries.mkdir()
+    (queries / "query-1.sql").write_text("SELECT sleep(0.01)")
+    (queries / "query-2.sql").write_text("SELECT sleep(0.01)")
+    runners = query_timer._create_query_runners(
+        directory=queries,
+        db_conn=ThreadLocalConnection(tmp_path / "database.db"),
+    )
+    query_timer._run_runners(runners=runners, repeat=3, parallel=True)
+
+    for runner in runners:
+        assert runner.repeat == 3
+        assert runner.median_time >= 0.01
+
+
+@pytest.mark.filterwarnings("ignore:The first timed run")
+@pytest.mark.parametrize("warmup, number", [(1, 1), (None, None)])
+def test__run_runners__in_parallel_connects_before_timing(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    warmup: Optional[int],
+    number: Optional[int],
+):
+    """
+    Test that the ``_run_runners`` function runs each runner in the same
+    thread for its untimed and timed runs, so that no connection is opened
+    inside a timed run.
+    """
+    queries = tmp_path / "queries"
+    queries.mkdir()
+    (queries / "query-1.sql").write_text("SELECT 1")
+    (queries / "query-2.sql").write_text("SELECT 2")
+    conn = ThreadLocalConnection(tmp_path / "database.db")
+    runners = query_timer._create_query_runners(directory=queries, db_conn=conn)
+
+    connections_before_timing = []
+    time_runners_in_threads = query_timer._time_runners_in_threads
+
+    def _time_runners_in_threads(**kwargs) -> None:
+        connections_before_timing.append(conn.connections)
+        time_runners_in_threads(**kwargs)
+
+    monkeypatch.setattr(
+        query_timer, "_time_runners_in_threads", _time_runners_in_threads
+    )
+    query_timer._run_runners(
+        runners=runners,
+        repeat=5,
+        warmup=warmup,
+        number=number,
+        parallel=True,
+    )
+
+    assert connections_before_timing == [len(runners)]
+    assert conn.connections == len(runners)
+
+
+@pytest.mark.filterwarnings("ignore:The first timed run")
+def test__run_runners__with_warmup(counting_runner: query_timer.Runner):
+    """
+    Test that the ``_run_runners`` function runs the warmup runs without
+    timing them.
+    """
+    query_timer._run_runners(runners=[counting_runner], repeat=3, warmup=2)
+
+    assert counting_runner.runner.calls == 1 + 2 + 3
+    assert counting_runner.repeat == 3
+    assert counting_runner.warmup_runs == 2
+
+
+@pytest.mark.filterwarnings("ignore:The first timed run")
+def test__run_runners__with_number(
+    runner_1: query_timer.Runner, runner_2: query_timer.Runner
+):
+    """
+    Test that the ``_run_runners`` function runs each runner ``number``
+    times per iteration, but only takes one sample per iteration.
+    """
+    query_timer._run_runners(
+        runners=[runner_1, runner_2],
+        repeat=3,
+        number=4,
+    )
+
+    assert runner_1.repeat == 12
+    assert runner_2.repeat == 12
+    assert len(runner_1.samples) == 3
+    assert len(runner_2.samples) == 3
+
+
+@pytest.mark.parametrize("number", [0, -1])
+def test__run_runners__with_invalid_number(
+    counting_runner: query_timer.Runner, number: int
+):
+    """
+    Test that the ``_run_runners`` function raises an error (rather than
+    calibrating) when ``number`` is less than 1, before running anything.
+    """
+    with pytest.raises(ValueError):
+        query_timer._run_runners(
+            runners=[counting_runner],
+            repeat=3,
+            number=number,
+        )
+
+    assert counting_runner.runner.calls == 0
+
+
+@pytest.mark.parametrize(
+    "sleep_time, expected",
+    [
+        (0.0, query_timer._MAX_CALIBRATED_NUMBER),
+        (1e-12, query_timer._MAX_CALIBRATED_NUMBER),
+        (0.001, 10),
+        (0.02, 1),
+    ],
+)
+def test__calibrate_number(
+    monkeypatch: pytest.MonkeyPatch, sleep_time: float, expected: int
+):
+    """
+    Test the ``_calibrate_number`` function.
+    """
+    monkeypatch.setattr(
+        query_timer.timeit, "timeit", lambda *args, **kwargs: sleep_time
+    )
+    runner = query_timer.Runner(runner=lambda: None, name="query-1.sql")
+
+    assert query_timer._calibrate_number(runner) == expected
+
+
+def test__calibrate_number__fast_runner(runner_1: query_timer.Runner):
+    """
+    Test that the ``_calibrate_number`` function batches fast runners.
+    """
+    assert query_timer._calibrate_number(runner_1) > 1
+
+
+def test__arun_runners(async_runner: query_timer.Runner):
+    """
+    Test the ``_arun_runners`` function.
+    """
+    asyncio.run(
+        query_timer._arun_runners(
+            runners=[async_runner],
+            repeat=3,
+        )
+    )
+
+    assert async_runner.repeat == 3
+    assert async_runner.total_time > 0
+
+
+@pytest.mark.parametrize(
+    "run_times, max_warmup, expected",
+    [
+        ([3, 2, 1, 1, 1], 16, 4),
+        ([3, 2, 3, 1, 1], 16, 3),
+        ([1, 1, 1, 1, 1], 16, 2),
+        ([5, 4, 3, 2, 1], 3, 3),
+    ],
+)
+def test__warm_up(
+    monkeypatch: pytest.MonkeyPatch,
+    run_times: list,
+    max_warmup: int,
+    expected: int,
+):
+    """
+    Test that the ``_warm_up`` function stops once the run time stops
+    decreasing.
+    """
+    clock = [0]
+    run_times = iter(run_times)
+
+    def runner() -> None:
+        clock[0] += next(run_times)
+
+    monkeypatch.setattr(query_timer.time, "perf_counter_ns", lambda: clock[0])
+    actual = query_timer._warm_up(
+        runner=query_timer.Runner(runner=runner, name="query-1.sql"),
+        max_warmup=max_warmup,
+    )
+
+    assert actual == expected
+
+
+@pytest.mark.filterwarnings("ignore:The first timed run")
+def test__run_runners__with_auto_warmup(runner_1: query_timer.Runner):
+    """
+    Test that the ``_run_runners`` function detects the warmup runs when
+    ``warmup`` is ``None``.
+    """
+    query_timer._run_runners(runners=[runner_1], repeat=3, warmup=None)
+
+    assert runner_1.repeat == 3
+    assert 2 <= runner_1.warmup_runs <= query_timer._MAX_WARMUP
+
+
+@pytest.mark.parametrize(
+    "first_elapsed_ns, warns",
+    [
+        (300_000_000, True),
+        (150_000_000, False),
+    ],
+)
+def test__warn_about_slow_first_runs(
+    runner_1: query_timer.Runner, first_elapsed_ns: int, warns: bool
+):
+    """
+    Test that the ``_warn_about_slow_first_runs`` function only warns when
+    the first timed run is much slower than the median run, and ignores
+    the cold start.
+    """
+    runner_1.cold_start_time = 10.0
+    runner_1.warmup_runs = 1
+    for elapsed_ns in [first_elapsed_ns, 100_000_000, 100_000_000]:
+        runner_1._record(elapsed_ns=elapsed_ns, n=1)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        query_timer._warn_about_slow_first_runs([runner_1])
+
+    assert bool(caught) is warns
+    if warns:
+        assert "after 1 warmup run(s)" in str(caught[0].message)
+
+
+def test__warn_about_slow_first_runs__without_samples(
+    runner_1: query_timer.Runner,
+):
+    """
+    Test that the ``_warn_about_slow_first_runs`` function doesn't warn
+    about runners that haven't been timed.
+    """
+    runner_1.cold_start_time = 10.0
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        query_timer._warn_about_slow_first_runs([runner_1])
+
+    assert not caught
+
+
 def test__print_runner_stats(directory: Path):
     """
     Test the ``_print_runner_stats`` function.
     """
     expected = [
-        "query-1.sql: 0.00000000s (0.0%)",
-        "query-2.sql: 0.00000000s (0.0%)",
+        "query-1.sql: median=0.00000000s stdev=0.00e+00s (0.0%)",
+        "query-2.sql: median=0.00000000s stdev=0.00e+00s (0.0%)",
     ]
 
     with contextlib.redirect_stdout(io.StringIO()) as stdout:
@@ -194,12 +954,73 @@ def test__print_runner_stats(directory: Path):
     assert actual == expected
 
 
-@pytest.mark.skip("Need to figure out how to unit test a decorator.")
+def test__runner__format_runtime__with_batches(runner_1: query_timer.Runner):
+    """
+    Test that the Runner's ``format_runtime`` method labels the standard
+    deviation with the batch size when the runs were timed in batches.
+    """
+    runner_1._record_many(
+        elapsed_ns=array.array("q", [1_000_000, 3_000_000]), n=1000
+    )
+
+    assert runner_1.format_runtime(total_median_time=2e-6) == (
+        "query-1.sql: median=0.00000200s stdev=1.00e-06s per 1000-run batch"
+        " (100.0%)"
+    )
+
+
+def test__runner__format_runtime__with_cold_start(
+    runner_1: query_timer.Runner,
+):
+    """
+    Test that the Runner's ``format_runtime`` method includes the cold
+    start time when there was one.
+    """
+    runner_1.cold_start_time = 0.5
+    runner_1._record(elapsed_ns=100_000_000, n=1)
+
+    assert runner_1.format_runtime(total_median_time=0.2) == (
+        "query-1.sql: median=0.10000000s stdev=0.00e+00s cold=0.50000000s"
+        " (50.0%)"
+    )
+
+
+def test__print_runner_stats__without_runners():
+    """
+    Test that the ``_print_runner_stats`` function prints nothing when
+    there are no runners.
+    """
+    with contextlib.redirect_stdout(io.StringIO()) as stdout:
+        query_timer._print_runner_stats(runners=[])
+
+    assert stdout.getvalue() == ""
+
+
 def test__print_times():
     """
     Test the ``_print_times`` function.
     """
-    pass
+    timestamp = r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}"
+    expected = [
+        re.compile(rf"Start time: {timestamp}"),
+        re.compile("-{40}"),
+        re.compile("Running"),
+        re.compile("-{40}"),
+        re.compile(rf"End time: {timestamp}"),
+    ]
+
+    @query_timer._print_times
+    def func() -> None:
+        print("Running")
+
+    with contextlib.redirect_stdout(io.StringIO()) as stdout:
+        func()
+    actual = stdout.getvalue().splitlines()
+
+    assert len(actual) == len(expected)
+    assert all(
+        pattern.fullmatch(line) for pattern, line in zip(expected, actual)
+    )
 
 
 def test__time_queries__with_error(db_connection: sqlite3.Connection):
@@ -213,3 +1034,40 @@ def test__time_queries__with_error(db_connection: sqlite3.Connection):
             repeat=1,
             directory="some-dir-that-does-not-exist",
         )
+
+
+def test__time_queries_async(db_connection: sqlite3.Connection, tmp_path: Path):
+    """
+    Test that the ``time_queries_async`` function prints a line for each
+    query.
+    """
+    (tmp_path / "query-1.sql").write_text("SELECT 1")
+    (tmp_path / "query-2.sql").write_text("SELECT 2")
+
+    with contextlib.redirect_stdout(io.StringIO()) as stdout:
+        asyncio.run(
+            query_timer.time_queries_async(
+                conn=AsyncConnection(db_connection),
+                repeat=2,
+                directory=tmp_path,
+            )
+        )
+    actual = stdout.getvalue()
+
+    assert "query-1.sql: median=" in actual
+    assert "query-2.sql: median=" in actual
+
+
+def test__time_queries_async__with_error(db_connection: sqlite3.Connection):
+    """
+    Test that the ``time_queries_async`` function raises an error when the
+    directory doesn't exist.
+    """
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(
+            query_timer.time_queries_async(
+                conn=AsyncConnection(db_connection),
+                repeat=1,
+                directory="some-dir-that-does-not-exist",
+            )
+        )